@@ -1,11 +1,10 @@
 """Display Zsh key bindings in more human-readable formats."""
-import argparse
-import re
-import subprocess
+import sys
 from collections import defaultdict
-from dataclasses import dataclass
 from importlib import metadata
-from typing import Dict, Iterable, List, Tuple
+from itertools import groupby
+from operator import attrgetter
+from typing import Dict, Iterable, List, NamedTuple, Tuple
 
 try:
     __version__ = metadata.version("zkeys")
@@ -13,12 +12,45 @@ except metadata.PackageNotFoundError:  # pragma: no cover
     __version__ = "unknown"
 
 
-@dataclass
-class Keybinding:
+PREFIXES = {
+    prefix: rank
+    for rank, prefix in enumerate(
+        [
+            "^",
+            "^[",
+            "^[^",
+            "M-",
+            "M-^",
+            "^X",
+            "^X^",
+            "^[[",
+            "^[O",
+            "^[[3",
+        ]
+    )
+}
+
+# Bound once for the parsing loop
+_PREFIX_RANK = PREFIXES.get
+
+IGNORE_WIDGETS = {
+    sys.intern(widget)
+    for widget in [
+        "bracketed-paste",
+        "digit-argument",
+        "neg-argument",
+        "self-insert-unmeta",
+    ]
+}
+
+BINDKEY_PREFIX = 'bindkey "'
+
+
+class Keybinding(NamedTuple):
     """
     Map an in-string like '^[b' to a ZLE widget like 'backward-word'.
 
-    >>> binding = Keybinding('^[b', 'backward-word')
+    >>> [binding] = Keybinding.from_bindkey(['bindkey "^[b" backward-word'])
     >>> binding.in_string
     '^[b'
     >>> binding.prefix
@@ -31,71 +63,59 @@ class Keybinding:
 
     in_string: str
     widget: str
-
-    PREFIXES = {
-        prefix: rank
-        for rank, prefix in enumerate(
-            [
-                "^",
-                "^[",
-                "^[^",
-                "M-",
-                "M-^",
-                "^X",
-                "^X^",
-                "^[[",
-                "^[O",
-                "^[[3",
-            ]
-        )
-    }
-
-    IGNORE_WIDGETS = {
-        "bracketed-paste",
-        "digit-argument",
-        "neg-argument",
-        "self-insert-unmeta",
-    }
+    prefix: str
+    character: str
+    # Precomputed for sorting, since every sort key needs them
+    prefix_rank: int
+    upper_character: str
 
     @classmethod
     def from_bindkey(cls, lines: Iterable[str]) -> Iterable["Keybinding"]:
         """Parse lines like 'bindkey "^[b" backward-word' into Keybinding objects."""
-        pattern = r'bindkey "(?P<in_string>.+)" (?P<widget>.+)'
+        start = len(BINDKEY_PREFIX)
 
         for line in lines:
-            if not (match := re.match(pattern, line)):
+            if not line.startswith(BINDKEY_PREFIX):
                 continue
 
-            in_string, widget = match.groups()
-            if widget in cls.IGNORE_WIDGETS:
+            # Split on the last '" ' to allow for escaped quotes, e.g. "^[\""
+            in_string, _, widget = line[start:].rpartition('" ')
+            if not in_string:
+                continue
+
+            # Many bindings share a widget, so this makes comparing them cheap
+            widget = sys.intern(widget)
+            if widget in IGNORE_WIDGETS:
                 continue
 
             # HACK: Remove slashes for readability, e.g. \M-\$ becomes M-$
             # Could be overzealous, esp. with custom keybindings
             in_string = in_string.replace("\\", "")
-            yield cls(in_string, widget)
-
-    @property
-    def prefix(self) -> str:
-        return self.in_string[:-1]
-
-    @property
-    def character(self) -> str:
-        return self.in_string[-1]
+            prefix, character = in_string[:-1], in_string[-1]
+            yield cls(
+                in_string,
+                widget,
+                prefix,
+                character,
+                _PREFIX_RANK(prefix, 999),
+                character.upper(),
+            )
 
     def prefix_comparison(self) -> Tuple[int, str]:
-        prefix_rank = self.PREFIXES.get(self.prefix, 999)
-        return (prefix_rank, self.character.upper())
+        return (self.prefix_rank, self.upper_character)
 
     def widget_comparison(self) -> Tuple[str, int, str]:
-        return (self.widget, *self.prefix_comparison())
+        return (self.widget, self.prefix_rank, self.upper_character)
 
 
 Row = Tuple[str, List[str]]
+Pair = Tuple[str, str]
 
 
 def main() -> None:
     """Process command-line arguments and print output."""
+    import argparse
+
     parser = argparse.ArgumentParser(
         description=__doc__.strip(),
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -136,66 +156,87 @@ def main() -> None:
     bindings = list(Keybinding.from_bindkey(input_lines))
 
     if args.widget:
-        rows = group_by_widget(bindings)
+        output_lines = format_table(group_by_widget(bindings))
     elif args.prefix:
-        rows = group_by_prefix(bindings)
+        output_lines = format_table(group_by_prefix(bindings))
     elif args.in_string:
-        rows = sort_by_in_string(bindings)
+        output_lines = format_pairs(sort_by_in_string(bindings))
     else:
-        rows = sort_by_widget(bindings)
+        output_lines = format_pairs(sort_by_widget(bindings))
 
-    for output_line in format_table(rows):
-        print(output_line)
+    print("\n".join(output_lines))
 
 
 def run_bindkey() -> Iterable[str]:
-    result = subprocess.run(
+    # Imported here so reading from a file doesn't pay for it
+    import subprocess
+
+    with subprocess.Popen(
         ["zsh", "--login", "--interactive", "-c", "bindkey -L"],
-        capture_output=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
         text=True,
-    )
-    return result.stdout.splitlines()
-
-
-def group_by_widget(bindings: Iterable[Keybinding]) -> Iterable[Row]:
-    widgets: Dict[str, List[str]] = defaultdict(list)
+    ) as process:
+        assert process.stdout is not None
+        for line in process.stdout:
+            yield line.rstrip("\n")
 
-    for binding in sorted(bindings, key=Keybinding.widget_comparison):
-        widgets[binding.widget].append(binding.in_string)
 
-    return widgets.items()
+def group_by_widget(bindings: Iterable[Keybinding]) -> List[Row]:
+    return [
+        (widget, [binding.in_string for binding in group])
+        for widget, group in groupby(
+            sorted(bindings, key=Keybinding.widget_comparison),
+            key=attrgetter("widget"),
+        )
+    ]
 
 
-def group_by_prefix(bindings: Iterable[Keybinding]) -> Iterable[Row]:
+def group_by_prefix(bindings: Iterable[Keybinding]) -> List[Row]:
+    # Unranked prefixes aren't sorted together, so group them with a dict
     prefixes: Dict[str, List[str]] = defaultdict(list)
 
     for binding in sorted(bindings, key=Keybinding.prefix_comparison):
         prefixes[binding.prefix].append(binding.character)
 
-    return prefixes.items()
+    return list(prefixes.items())
 
 
-def sort_by_in_string(bindings: Iterable[Keybinding]) -> List[Row]:
+def sort_by_in_string(bindings: Iterable[Keybinding]) -> List[Pair]:
     return [
-        (binding.in_string, [binding.widget])
+        (binding.in_string, binding.widget)
         for binding in sorted(bindings, key=Keybinding.prefix_comparison)
     ]
 
 
-def sort_by_widget(bindings: Iterable[Keybinding]) -> List[Row]:
+def sort_by_widget(bindings: Iterable[Keybinding]) -> List[Pair]:
     return [
-        (binding.in_string, [binding.widget])
+        (binding.in_string, binding.widget)
         for binding in sorted(bindings, key=Keybinding.widget_comparison)
     ]
 
 
 def format_table(rows: Iterable[Row]) -> Iterable[str]:
-    key_width = max(len(k) for k, _ in rows) + 4
-    value_width = max(len(v) for _, values in rows for v in values)
+    rows = list(rows)
+    key_width = value_width = 0
 
     for key, values in rows:
-        values = [f"{v:{value_width}}" for v in values]
-        yield f"{key:{key_width}}{' '.join(values).strip()}"
+        key_width = max(key_width, len(key))
+        value_width = max(value_width, *map(len, values))
+
+    key_width += 4
+
+    for key, values in rows:
+        values = [v.ljust(value_width) for v in values]
+        yield key.ljust(key_width) + " ".join(values).rstrip()
+
+
+def format_pairs(pairs: Iterable[Pair]) -> Iterable[str]:
+    pairs = list(pairs)
+    key_width = max((len(key) for key, _ in pairs), default=0) + 4
+
+    for key, value in pairs:
+        yield key.ljust(key_width) + value
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -52,6 +52,7 @@ bindkey "^[q" push-line
 bindkey "^_" undo
 bindkey "\M-Q" push-line
 bindkey "\M-q" push-line
+bindkey "^X"
 """
 
 